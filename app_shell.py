@@ -0,0 +1,138 @@
+# app_shell.py
+"""
+Shared shell for the dashboard pages: theme, sidebar logo and startup timing.
+
+The theme CSS and the logo bytes are built once per process and reused by
+every rerun of every page. Plotly is imported the first time a page builds
+a figure, so a page's title and metrics reach the browser before the chart
+library has loaded.
+"""
+import functools
+import importlib
+import os
+import sys
+
+import streamlit as st
+
+from hajj import instrumentation
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(ROOT, "logo.png")
+
+# --- Custom CSS for Tabung Haji Theme ---
+_BASE_CSS = """
+    /* Main colors */
+    :root {
+        --primary-color: #014034; /* Dark Green from TH */
+        --secondary-color: #04d61d; /* Lighter Green for buttons */
+        --background-color: #F0F2F6; /* Light gray background */
+        --text-color: #262730;
+        --secondary-text-color: #FFFFFF;
+    }
+
+    /* General app styling */
+    .stApp {
+        background-color: var(--background-color);
+    }
+
+    /* Sidebar styling */
+    [data-testid="stSidebar"] {
+        background-color: var(--secondary-color);
+    }
+
+    /* This targets all text and links within the sidebar nav items */
+    [data-testid="stSidebar"] .st-emotion-cache-16txtl3 a,
+    [data-testid="stSidebar"] .st-emotion-cache-16txtl3 {
+        color: var(--secondary-text-color);
+    }
+
+    /* Button styling */
+    .stButton>button {
+        color: var(--secondary-text-color);
+        background-color: {button};
+        border: none;
+        border-radius: 4px;
+    }
+    .stButton>button:hover {
+        background-color: {hover};
+        color: var(--secondary-text-color);
+    }
+"""
+
+_CARD_CSS = """
+    /* Metric styling */
+    [data-testid="stMetric"] {
+        background-color: #FFFFFF;
+        border-radius: 8px;
+        padding: 15px;
+        border: 1px solid #E0E0E0;
+    }
+
+    /* Alert boxes */
+    [data-testid="stAlert"] {
+        border-radius: 8px;
+    }
+
+    /* Progress bar styling */
+    [data-testid="stProgressBar"] > div > div > div > div {
+        background-color: var(--secondary-color);
+    }
+"""
+
+# Light-green buttons and card styling by default; the Classification Engine
+# keeps its dark-green buttons and plain metrics.
+THEMES = {
+    "default": {"button": "var(--secondary-color)", "hover": "#27AE60", "cards": True},
+    "dark buttons": {"button": "var(--primary-color)", "hover": "#02594A", "cards": False},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def theme_css(variant="default"):
+    """The theme's <style> block, built once per process and variant."""
+    theme = THEMES[variant]
+    css = _BASE_CSS.replace("{button}", theme["button"]).replace("{hover}", theme["hover"])
+    if theme["cards"]:
+        css += _CARD_CSS
+    return f"<style>{css}</style>"
+
+
+@functools.lru_cache(maxsize=None)
+def logo_bytes():
+    """The sidebar logo, read from disk once per process; None if it is missing."""
+    try:
+        with open(LOGO_PATH, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# --- Page Shell ---
+def start_page(page, theme="default"):
+    """
+    Starts timing the rerun, injects the theme and draws the sidebar logo.
+    Call right after st.set_page_config. Returns the metrics export port, if any.
+    """
+    instrumentation.start_rerun(page)
+    export_port = instrumentation.start_exporter()
+    with instrumentation.section("theme injection"):
+        st.markdown(theme_css(theme), unsafe_allow_html=True)
+
+    # --- Sidebar ---
+    with st.sidebar:
+        logo = logo_bytes()
+        if logo is not None:
+            st.image(logo, use_container_width=True)
+        else:
+            st.write("Place your logo.png file in the main app directory")
+    return export_port
+
+
+def plotly_express():
+    """plotly.express, imported on first use; the import is timed as its own section."""
+    if "plotly.express" in sys.modules:
+        # import_module waits for another thread's import still in progress;
+        # sys.modules alone can hand back a partially initialized module.
+        return importlib.import_module("plotly.express")
+    with instrumentation.section("plotly import"):
+        return importlib.import_module("plotly.express")
@@ -0,0 +1 @@
+"""Performance benchmarks for the hajj compute engines. Run with `python -m benchmarks.run`."""
@@ -0,0 +1,94 @@
+# benchmarks/import_budget.py
+"""
+Import-time budget for the compute package.
+
+Imports each module in a fresh interpreter, takes the best of several runs
+of `python -X importtime` and fails when a module pulls in a library it
+should leave to first use, or is far slower than its budget. The forbidden
+imports are the real invariant; budgets are multiples of `import numpy`
+timed the same way on the same machine, so a slower runner or a library
+upgrade moves them together. Process-pool workers and
+CLI jobs pay these imports on every start, so they are kept small.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> (budget as a multiple of the `import numpy` time, libraries it must not load).
+REFERENCE_MODULE = "numpy"
+UI = ("streamlit", "plotly")
+HEAVY = ("numpy", "pandas", "scipy", "pyarrow")
+BUDGETS = {
+    "hajj": (0.25, UI + HEAVY),
+    "hajj.scenarios": (0.25, UI + HEAVY),
+    "hajj.scoring": (0.25, UI + HEAVY),
+    "hajj.projections": (0.25, UI + HEAVY),
+    "hajj.instrumentation": (0.25, UI + HEAVY + ("http.server",)),
+    "hajj.__main__": (0.25, UI + HEAVY),
+    "hajj.queue_index": (3, UI + ("pandas", "scipy", "pyarrow")),
+    "hajj.appeals": (3, UI + ("pandas", "scipy", "pyarrow")),
+    "hajj.synthetic": (3, UI + ("pandas", "scipy", "pyarrow")),
+    # These take DataFrames, so pandas (and the pyarrow it may load) is part of the cost.
+    "hajj.data_quality": (15, UI + ("scipy",)),
+    "hajj.resource_planning": (40, UI),
+}
+
+_PROBE = "import sys, {module}; print(','.join(sorted(sys.modules)))"
+
+
+def measure(module):
+    """Import time of `module` in ms in a fresh interpreter, and the modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    # The cumulative column of the importtime line for `module` itself.
+    total_us = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            total_us = int(fields[1])
+    return total_us / 1000, set(result.stdout.strip().split(","))
+
+
+def best_of(module, runs):
+    """Fastest of `runs` fresh imports, with the modules that run loaded."""
+    return min((measure(module) for _ in range(runs)), key=lambda r: r[0])
+
+
+def check(module, runs, reference_ms):
+    """Returns (best ms, budget ms, list of violations) for one module."""
+    factor, forbidden = BUDGETS[module]
+    budget = factor * reference_ms
+    best, loaded = best_of(module, runs)
+    violations = [f"imports {name}" for name in forbidden if name in loaded]
+    if best > budget:
+        violations.append(f"{best:.1f} ms over the {budget:.0f} ms budget")
+    return best, budget, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modules", nargs="+", choices=sorted(BUDGETS), default=list(BUDGETS))
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module; the best run counts")
+    args = parser.parse_args(argv)
+
+    reference_ms, _ = best_of(REFERENCE_MODULE, args.runs)
+    print(f"{'import ' + REFERENCE_MODULE:<24} {reference_ms:>8.1f} ms (reference)", flush=True)
+    failed = False
+    for module in args.modules:
+        best, budget, violations = check(module, args.runs, reference_ms)
+        status = "FAIL " + "; ".join(violations) if violations else "ok"
+        print(f"{module:<24} {best:>8.1f} ms {budget:>6.0f} ms budget  {status}", flush=True)
+        failed = failed or bool(violations)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+# benchmarks/loadtest.py
+"""
+Headless multi-session load test for the Streamlit pages.
+
+Starts the app with `streamlit run` in headless mode and drives many
+concurrent sessions against it over local websockets, speaking the same
+protobuf protocol as the browser. Each session follows a scripted sequence
+of realistic interactions (page loads, filter changes, form submissions, the
+sensitivity explorer, "Generate New Sample" clicks). For each session count the harness reports
+rerun latency percentiles, throughput and the server's memory.
+
+Streamlit's in-process AppTest API swaps a global runtime on every run, so
+it cannot drive concurrent sessions; a real server also measures what a
+deployment actually sees. The client needs the `websockets` package,
+which recent Streamlit releases already install.
+
+    python -m benchmarks.loadtest                          # ramp 1, 5, 10, 25 sessions
+    python -m benchmarks.loadtest --sessions 50 --iterations 5
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = "Forecast_Dashboard.py"
+DEFAULT_SESSIONS = [1, 5, 10, 25]
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "loadtest_results.json")
+RERUN_TIMEOUT = 60
+STARTUP_TIMEOUT = 60
+
+
+# --- Server ---
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    """Starts the app headless on `port` and waits until it reports healthy."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", MAIN_SCRIPT,
+         "--server.headless=true", f"--server.port={port}", "--server.address=127.0.0.1",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Streamlit server did not become healthy in time")
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux)."""
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+# --- Sessions ---
+class Session:
+    """One browser-like websocket session with its own widget state."""
+
+    def __init__(self, url):
+        self.url = url
+        self.elements = {}
+        self.widget_states = {}
+        self.page = None
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, page, changes=()):
+        """
+        Sends a rerun for `page` with the session's widget state plus `changes`
+        and waits for the script to finish. Returns (seconds, ok).
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        if page != self.page:
+            self.page, self.elements, self.widget_states = page, {}, {}
+        msg = BackMsg()
+        msg.rerun_script.page_name = page
+        triggers = []
+        for state in changes:
+            if state.WhichOneof("value") == "trigger_value":
+                triggers.append(state)
+            else:
+                self.widget_states[state.id] = state
+        msg.rerun_script.widget_states.widgets.extend([*self.widget_states.values(), *triggers])
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        ok = True
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT))
+            kind = reply.WhichOneof("type")
+            if kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element_type = reply.delta.new_element.WhichOneof("type")
+                element = getattr(reply.delta.new_element, element_type)
+                if element_type == "exception":
+                    ok = False
+                elif getattr(element, "label", ""):
+                    self.elements[element.label] = element
+            elif kind == "script_finished":
+                status = reply.script_finished
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                ok = ok and status != ForwardMsg.FINISHED_WITH_COMPILE_ERROR
+                return time.perf_counter() - start, ok
+
+    def widget(self, label, **value):
+        """WidgetState setting the widget labelled `label` to `value`."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=self.elements[label].id)
+        if "double_array_value" in value:
+            state.double_array_value.data.extend(value.pop("double_array_value"))
+        for field, field_value in value.items():
+            setattr(state, field, field_value)
+        return state
+
+
+# --- Interaction Scripts ---
+# Each script yields (action, changes) pairs for one visit to a page; the
+# first rerun of every visit is the page load.
+def _forecast_steps(session, rng):
+    yield "rerun", []
+
+
+def _classification_steps(session, rng):
+    yield "submit prediction", [
+        session.widget("Age", double_array_value=[int(rng.integers(20, 91))]),
+        session.widget("Monthly Salary (MYR)", int_value=int(rng.integers(2, 60)) * 500),
+        session.widget("Number of Previous Deferments", int_value=int(rng.integers(0, 4))),
+        session.widget("Predict Acceptance Likelihood", trigger_value=True),
+    ]
+    if rng.random() < 0.3:
+        yield "explore sensitivity", [
+            session.widget("Show how the prediction changes with age, salary and deferments", bool_value=True),
+        ]
+    if rng.random() < 0.2:
+        yield "generate new sample", [session.widget("Generate New Sample Data", trigger_value=True)]
+
+
+def _analytics_steps(session, rng):
+    regions = list(session.elements["Filter by Region"].options)
+    age_groups = list(session.elements["Filter by Age Group"].options)
+    yield "change filters", [
+        session.widget("Filter by Region", string_value=regions[int(rng.integers(len(regions)))]),
+        session.widget("Filter by Age Group", string_value=age_groups[int(rng.integers(len(age_groups)))]),
+    ]
+
+
+def _status_steps(session, rng):
+    yield "rerun", []
+
+
+PAGES = {
+    "Forecast_Dashboard": _forecast_steps,
+    "Classification_Engine": _classification_steps,
+    "Advanced_Analytics": _analytics_steps,
+    "System_Status": _status_steps,
+}
+
+
+async def _run_session(url, session_id, pages, iterations, seed):
+    """Drives one session through the pages; returns (page, action, seconds, ok) samples."""
+    rng = np.random.default_rng([seed, session_id])
+    session = Session(url)
+    samples = []
+    try:
+        await session.connect()
+        for _ in range(iterations):
+            for page in rng.permutation(pages).tolist():
+                samples.append((page, "load", *await session.rerun(page)))
+                for action, changes in PAGES[page](session, rng):
+                    samples.append((page, action, *await session.rerun(page, changes)))
+        await session.close()
+    except Exception as e:
+        print(f"Session {session_id} failed: {e!r}", file=sys.stderr)
+        samples.append(("session", "error", float("nan"), False))
+    return samples
+
+
+async def run_level(url, server_pid, sessions, pages, iterations, seed=0):
+    """Runs `sessions` concurrent sessions and summarizes their reruns."""
+    peak_rss = rss_mb(server_pid)
+
+    async def sample_memory():
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss, rss_mb(server_pid))
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.create_task(sample_memory())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_run_session(url, i, pages, iterations, seed) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    samples = [sample for result in results for sample in result]
+    latencies = np.array([seconds for _, _, seconds, ok in samples if ok])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (np.nan,) * 3
+    by_action = {}
+    for page, action, seconds, ok in samples:
+        if ok:
+            by_action.setdefault(f"{page}: {action}", []).append(seconds)
+    return {
+        "sessions": sessions,
+        "reruns": len(samples),
+        "errors": sum(not ok for *_, ok in samples),
+        "elapsed_s": elapsed,
+        "reruns_per_sec": latencies.size / elapsed,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "server_rss_mb": rss_mb(server_pid),
+        "server_peak_rss_mb": peak_rss,
+        "actions": {
+            key: {"count": len(values), "p50_ms": float(np.median(values)) * 1000, "p95_ms": float(np.percentile(values, 95)) * 1000}
+            for key, values in sorted(by_action.items())
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="concurrent session counts to ramp through")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=list(PAGES))
+    parser.add_argument("--iterations", type=int, default=2, help="passes over the pages per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=None, help="server port (default: any free port)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    args = parser.parse_args(argv)
+
+    port = args.port or _free_port()
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    server = start_server(port)
+    levels = []
+    try:
+        print(f'{"sessions":>8} {"reruns":>7} {"errors":>6} {"reruns/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"server MB":>10}')
+        for sessions in args.sessions:
+            level = asyncio.run(run_level(url, server.pid, sessions, args.pages, args.iterations, args.seed))
+            levels.append(level)
+            print(f'{level["sessions"]:>8} {level["reruns"]:>7} {level["errors"]:>6} {level["reruns_per_sec"]:>9.1f} '
+                  f'{level["p50_ms"]:>9.0f} {level["p95_ms"]:>9.0f} {level["p99_ms"]:>9.0f} {level["server_peak_rss_mb"]:>10.0f}', flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    with open(args.results, "w") as f:
+        json.dump({
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "levels": levels,
+        }, f, indent=2)
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# benchmarks/run.py
+"""
+Benchmark suite with regression gates.
+
+Times acceptance scoring (per row and batch), sample generation and the
+Advanced Analytics filter at input sizes from 10^3 to 10^7 rows, and the
+wait-time projections at the dashboard's own 12-year input, records throughput and peak memory to a JSON results file
+and compares them with a stored baseline. Each timing loops the operation
+for at least MIN_LOOP_SECONDS, and apparent regressions are measured again
+before they count. Exits non-zero when a benchmark regresses beyond the
+tolerance. Runs headless; nothing here imports
+Streamlit or Plotly.
+
+    python -m benchmarks.run                      # run and compare with the baseline
+    python -m benchmarks.run --save-baseline      # run and store the results as the new baseline
+    python -m benchmarks.run --sizes 1000 100000  # run selected sizes only
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from hajj.projections import filter_records, wait_time_projections
+from hajj.scoring import generate_sample_data, predict_acceptance, predict_acceptance_batch
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+DEFAULT_RESULTS = os.path.join(HERE, "results.json")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+# Peak memory below this many MB is treated as noise when comparing.
+MEMORY_SLACK_MB = 1.0
+ROW_CHUNK = 100_000
+# Each timing repeats the operation until the loop takes at least this long,
+# so sub-millisecond runs are not compared on timer noise.
+MIN_LOOP_SECONDS = 0.2
+# A benchmark that looks regressed is measured again up to this many times,
+# keeping its best result, before it is reported.
+CONFIRM_RUNS = 2
+
+
+# --- Inputs ---
+def _candidates(size, rng):
+    return pd.DataFrame({
+        'age': rng.integers(20, 91, size),
+        'salary': rng.integers(1000, 30001, size),
+        'dependents': rng.integers(0, 16, size),
+        'health': rng.choice(["Excellent", "Good", "Fair", "Poor"], size),
+        'deferments': rng.integers(0, 11, size),
+    })
+
+
+def _waitlist_records(size, rng):
+    return pd.DataFrame({
+        "Region": rng.choice(["Central", "Eastern", "Western", "Northern", "Southern"], size),
+        "Age": rng.integers(18, 100, size),
+        "Wait Years": rng.integers(0, 150, size),
+    })
+
+
+# --- Benchmarks ---
+# Each benchmark is (setup, run): setup builds untimed inputs for a size,
+# run is the timed operation.
+def _score_rows(df):
+    # Builds each row's feature dict, as the prediction form does.
+    keys = ['age', 'salary', 'dependents', 'health', 'deferments']
+    for start in range(0, len(df), ROW_CHUNK):
+        chunk = df.iloc[start:start + ROW_CHUNK]
+        for row in zip(*(chunk[key].tolist() for key in keys)):
+            predict_acceptance(dict(zip(keys, row)))
+
+
+BENCHMARKS = {
+    "predict_acceptance_row": (_candidates, _score_rows),
+    "predict_acceptance_batch": (_candidates, predict_acceptance_batch),
+    "generate_sample_data": (lambda size, rng: size, lambda size: generate_sample_data(size, seed=0)),
+    "wait_time_projections": (lambda size, rng: size, lambda size: wait_time_projections(n_years=size)),
+    "filter_records": (_waitlist_records, lambda df: filter_records(df, "Central", "60-70")),
+}
+
+# Benchmarks whose input does not grow with the row count run only at the
+# size the pages use: the dashboard projects 12 years for each scenario.
+FIXED_SIZES = {
+    "wait_time_projections": 12,
+}
+
+
+def _time_loop(run, inputs, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        run(inputs)
+    return time.perf_counter() - start
+
+
+def measure(name, size, repeats):
+    """
+    Best per-run wall time over `repeats` loops, then one traced run for peak
+    memory. Like timeit's autorange, the loop length doubles until a loop
+    takes at least MIN_LOOP_SECONDS.
+    """
+    setup, run = BENCHMARKS[name]
+    inputs = setup(size, np.random.default_rng(0))
+    loops = 1
+    elapsed = _time_loop(run, inputs, loops)
+    while elapsed < MIN_LOOP_SECONDS:
+        loops *= 2
+        elapsed = _time_loop(run, inputs, loops)
+    best = elapsed / loops
+    for _ in range(repeats - 1):
+        best = min(best, _time_loop(run, inputs, loops) / loops)
+
+    tracemalloc.start()
+    try:
+        run(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "benchmark": name,
+        "size": size,
+        "seconds": best,
+        "rows_per_sec": size / best if best > 0 else float("inf"),
+        "peak_mb": peak / 2 ** 20,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns a description of every result that regressed against the baseline."""
+    base = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        ref = base.get((result["benchmark"], result["size"]))
+        if ref is None:
+            continue
+        label = f'{result["benchmark"]} @ {result["size"]:,}'
+        if result["rows_per_sec"] < ref["rows_per_sec"] * (1 - tolerance):
+            regressions.append(f'{label}: throughput {result["rows_per_sec"]:,.0f}/s vs baseline {ref["rows_per_sec"]:,.0f}/s')
+        if result["peak_mb"] > ref["peak_mb"] * (1 + tolerance) + MEMORY_SLACK_MB:
+            regressions.append(f'{label}: peak memory {result["peak_mb"]:.1f} MB vs baseline {ref["peak_mb"]:.1f} MB')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5, help="timed loops per benchmark below 10^6 rows")
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    def run(name, size):
+        result = measure(name, size, args.repeats if size < 10 ** 6 else 1)
+        print(f'{name:<26} {size:>12,} {result["seconds"]:>10.4f}s {result["rows_per_sec"]:>16,.0f} rows/s {result["peak_mb"]:>10.1f} MB', flush=True)
+        return result
+
+    results = [
+        run(name, size)
+        for name in args.benchmarks
+        for size in ([FIXED_SIZES[name]] if name in FIXED_SIZES else args.sizes)
+    ]
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Re-measure apparent regressions so one noisy stretch on the machine
+        # does not fail the gate; a real slowdown stays slow on every attempt.
+        for _ in range(CONFIRM_RUNS):
+            flagged = [i for i, result in enumerate(results) if compare([result], baseline, args.tolerance)]
+            if not flagged:
+                break
+            print(f"Re-measuring {len(flagged)} possible regression(s)...", flush=True)
+            for i in flagged:
+                again = run(results[i]["benchmark"], results[i]["size"])
+                if again["seconds"] < results[i]["seconds"]:
+                    again["peak_mb"] = min(again["peak_mb"], results[i]["peak_mb"])
+                    results[i] = again
+                else:
+                    results[i]["peak_mb"] = min(again["peak_mb"], results[i]["peak_mb"])
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(args.results, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} of baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
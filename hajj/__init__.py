@@ -0,0 +1,20 @@
+"""
+Computation engines behind the Hajj Analytics System dashboard pages.
+
+Nothing in this package imports Streamlit or Plotly, so the pages and the
+command-line jobs (`python -m hajj`) share the same code. Submodules load
+on first attribute access and import numpy, pandas and scipy only where
+they are needed; `python -m benchmarks.import_budget` keeps it that way.
+"""
+import importlib
+
+__all__ = [
+    "appeals", "data_quality", "instrumentation", "projections", "queue_index",
+    "resource_planning", "scenarios", "scoring", "synthetic",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
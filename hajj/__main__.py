@@ -0,0 +1,85 @@
+# hajj/__main__.py
+"""
+Batch jobs built on the compute engines, for running outside Streamlit.
+
+    python -m hajj score candidates.csv scored.csv
+    python -m hajj projections --years 20
+    python -m hajj appeals-sweep --reviewers 40 50 60 70 --replications 5
+    python -m hajj synth data/depositors --rows 10000000
+
+Each command imports its engine only when it runs, so `--help` and the
+lighter commands start without loading numpy or pandas.
+"""
+import argparse
+import sys
+
+
+def _score(args):
+    import pandas as pd
+
+    from hajj.scoring import predict_acceptance_batch
+
+    df = pd.read_csv(args.input)
+    df['Prediction'], df['Confidence'] = predict_acceptance_batch(df)
+    df.to_csv(args.output, index=False)
+    print(f"Scored {len(df):,} candidates into {args.output}")
+
+
+def _projections(args):
+    from hajj.projections import wait_time_projections
+
+    print(wait_time_projections(args.start_year, args.years).to_string())
+
+
+def _appeals_sweep(args):
+    from hajj.appeals import AppealsConfig, sweep_capacity
+
+    config = AppealsConfig(arrival_rate=args.arrival_rate, seed=args.seed)
+    results = sweep_capacity(config, args.reviewers, args.replications, args.workers)
+    print(results.groupby("reviewers").mean(numeric_only=True).drop(columns="replication").to_string())
+
+
+def _synth(args):
+    from hajj.synthetic import write_dataset
+
+    paths = write_dataset(args.path, args.rows, args.seed, file_format=args.format, max_workers=args.workers)
+    print(f"Wrote {args.rows:,} depositors in {len(paths)} shard(s) under {args.path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hajj", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="score a CSV of candidates")
+    score.add_argument("input")
+    score.add_argument("output")
+    score.set_defaults(run=_score)
+
+    projections = commands.add_parser("projections", help="print wait-time projections per scenario")
+    projections.add_argument("--start-year", type=int, default=2024)
+    projections.add_argument("--years", type=int, default=12)
+    projections.set_defaults(run=_projections)
+
+    sweep = commands.add_parser("appeals-sweep", help="simulate the appeals queue across reviewer counts")
+    sweep.add_argument("--reviewers", type=int, nargs="+", default=[40, 50, 60, 70, 80])
+    sweep.add_argument("--replications", type=int, default=5)
+    sweep.add_argument("--arrival-rate", type=float, default=300.0)
+    sweep.add_argument("--seed", type=int, default=0)
+    sweep.add_argument("--workers", type=int, default=None)
+    sweep.set_defaults(run=_appeals_sweep)
+
+    synth = commands.add_parser("synth", help="write a synthetic depositor dataset")
+    synth.add_argument("path")
+    synth.add_argument("--rows", type=int, default=1_000_000)
+    synth.add_argument("--seed", type=int, default=0)
+    synth.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    synth.add_argument("--workers", type=int, default=None)
+    synth.set_defaults(run=_synth)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# hajj/appeals.py
+"""
+Discrete-event simulation of the appeals processing pipeline.
+
+Appeals arrive as a (possibly time-varying) Poisson process, wait in a single
+FIFO queue and are handled by a pool of identical reviewers. Entity state is
+kept in flat numpy arrays indexed by appeal number, and the event loop only
+keeps the reviewers' next-free times on a heap, so a year of 100k+ appeals
+runs in a fraction of a second.
+"""
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+DAYS_PER_YEAR = 365
+
+
+# --- Configuration ---
+@dataclass(frozen=True)
+class AppealsConfig:
+    """Inputs for one simulation run. All times are in days."""
+    arrival_rate: object = 300.0        # appeals per day, scalar or one value per day
+    reviewers: int = 60
+    service_mean: float = 0.2           # mean days of reviewer effort per appeal
+    service_cv: float = 0.5             # coefficient of variation of service time
+    service_dist: str = "lognormal"     # "exponential", "lognormal", "gamma" or "deterministic"
+    initial_backlog: int = 85000        # appeals already pending at time zero
+    horizon: float = DAYS_PER_YEAR
+    seed: object = None                 # int or numpy SeedSequence
+
+
+# --- Random Draws ---
+def _draw_arrivals(config, rng):
+    """Returns sorted arrival times, with the initial backlog arriving at time zero."""
+    days = int(np.ceil(config.horizon))
+    rates = np.broadcast_to(np.asarray(config.arrival_rate, dtype=float), (days,))
+    counts = rng.poisson(rates)
+    day_index = np.repeat(np.arange(days), counts)
+    new_arrivals = np.sort(day_index + rng.random(day_index.size))
+    new_arrivals = new_arrivals[new_arrivals < config.horizon]
+    return np.concatenate([np.zeros(config.initial_backlog), new_arrivals])
+
+
+def _draw_service_times(config, rng, size):
+    """Draws service times with the configured mean and coefficient of variation."""
+    mean, cv = config.service_mean, config.service_cv
+    if config.service_dist == "deterministic" or cv == 0:
+        return np.full(size, mean)
+    if config.service_dist == "exponential":
+        return rng.exponential(mean, size)
+    if config.service_dist == "lognormal":
+        sigma2 = np.log1p(cv ** 2)
+        return rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2), size)
+    if config.service_dist == "gamma":
+        shape = 1 / cv ** 2
+        return rng.gamma(shape, mean / shape, size)
+    raise ValueError(f"Unknown service time distribution: {config.service_dist!r}")
+
+
+# --- Event Loop ---
+def _run_queue(arrivals, service, reviewers):
+    """
+    Processes appeals in arrival order. The heap holds (next_free_time, reviewer)
+    for every reviewer, so each appeal start is a single heap replacement.
+    """
+    n = arrivals.size
+    start = np.empty(n)
+    reviewer = np.empty(n, dtype=np.int32)
+    free_at = [(0.0, r) for r in range(reviewers)]
+    arrivals_list = arrivals.tolist()
+    service_list = service.tolist()
+    for i in range(n):
+        t_free, r = free_at[0]
+        t_start = arrivals_list[i] if arrivals_list[i] > t_free else t_free
+        heapq.heapreplace(free_at, (t_start + service_list[i], r))
+        start[i] = t_start
+        reviewer[i] = r
+    return start, start + service, reviewer
+
+
+class SimulationResult:
+    """Array-backed per-appeal state plus summary statistics for one run."""
+
+    def __init__(self, config, arrival, start, finish, reviewer):
+        self.config = config
+        self.arrival = arrival
+        self.start = start
+        self.finish = finish
+        self.reviewer = reviewer
+
+    @property
+    def wait(self):
+        return self.start - self.arrival
+
+    def backlog_at(self, times):
+        """Number of appeals arrived but not yet resolved at each of `times`."""
+        times = np.asarray(times, dtype=float)
+        arrived = np.searchsorted(self.arrival, times, side="right")
+        resolved = np.searchsorted(np.sort(self.finish), times, side="right")
+        return arrived - resolved
+
+    def daily_backlog(self):
+        return self.backlog_at(np.arange(1, int(np.ceil(self.config.horizon)) + 1))
+
+    def summary(self):
+        """
+        Key statistics for the simulated horizon. Appeals still waiting for a
+        reviewer at the horizon count with their wait so far (horizon minus
+        arrival), so under overload the wait statistics are lower bounds
+        rather than biased towards the appeals that got through.
+        """
+        horizon = self.config.horizon
+        done = self.finish <= horizon
+        wait = np.minimum(self.start, horizon) - self.arrival
+        busy = np.clip(np.minimum(self.finish, horizon) - self.start, 0, None).sum()
+        return {
+            "reviewers": self.config.reviewers,
+            "arrivals": int(self.arrival.size - self.config.initial_backlog),
+            "resolved": int(done.sum()),
+            "backlog_end": int(self.arrival.size - done.sum()),
+            "mean_wait_days": float(wait.mean()) if wait.size else float("nan"),
+            "p90_wait_days": float(np.percentile(wait, 90)) if wait.size else float("nan"),
+            "censored_waits": int((self.start > horizon).sum()),
+            "utilisation": float(busy / (self.config.reviewers * horizon)),
+        }
+
+
+def simulate(config=AppealsConfig()):
+    """Runs one replication of the appeals queue and returns a SimulationResult."""
+    if config.reviewers < 1:
+        raise ValueError("At least one reviewer is required.")
+    rng = np.random.default_rng(config.seed)
+    arrival = _draw_arrivals(config, rng)
+    service = _draw_service_times(config, rng, arrival.size)
+    start, finish, reviewer = _run_queue(arrival, service, config.reviewers)
+    return SimulationResult(config, arrival, start, finish, reviewer)
+
+
+# --- Capacity Planning ---
+def _simulate_summary(config):
+    return simulate(config).summary()
+
+
+def sweep_capacity(config, reviewer_counts, replications=5, max_workers=None):
+    """
+    Simulates every reviewer count `replications` times across a process pool
+    and returns one summary row per run. Each run gets an independent random
+    stream spawned from `config.seed`, so sweeps are reproducible.
+    """
+    import pandas as pd
+
+    root = config.seed if isinstance(config.seed, np.random.SeedSequence) else np.random.SeedSequence(config.seed)
+    seeds = root.spawn(len(reviewer_counts) * replications)
+    runs = [
+        replace(config, reviewers=int(count), seed=seeds[i * replications + rep])
+        for i, count in enumerate(reviewer_counts)
+        for rep in range(replications)
+    ]
+    workers = max_workers or min(len(runs), os.cpu_count() or 1)
+    if workers <= 1:
+        summaries = [_simulate_summary(run) for run in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(_simulate_summary, runs, chunksize=max(1, len(runs) // (workers * 4))))
+    results = pd.DataFrame(summaries)
+    results.insert(1, "replication", [rep for _ in reviewer_counts for rep in range(replications)])
+    return results
@@ -0,0 +1,332 @@
+# hajj/instrumentation.py
+"""
+Per-process render instrumentation for the Streamlit pages.
+
+Pages call `start_rerun` at the top of the script, wrap named sections in
+`section(...)`, call `first_paint` once their first content is on screen
+and call `finish_rerun` at the end. Timings go into
+fixed-bucket histograms keyed by (page, section). Every thread records into
+its own shard, so the hot path takes no locks; readers merge the shards when
+taking a snapshot, and shards of finished script threads are folded into a
+retired total. The first rerun of each page in a process is also kept as
+that page's cold start. The module also tracks active sessions, the number
+of reruns in flight and process memory, and can serve everything over HTTP
+for scraping.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in milliseconds; a final bucket holds the overflow.
+BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+# A session counts as active if it reran within this many seconds.
+ACTIVE_SESSION_WINDOW = 300
+# Reruns that never reported back (e.g. interrupted by st.rerun) stop counting after this.
+STALE_RERUN_SECONDS = 60
+# Fold finished threads' shards once this many are registered.
+MAX_SHARDS = 64
+METRICS_PORT_ENV = "HAJJ_METRICS_PORT"
+METRICS_HOST_ENV = "HAJJ_METRICS_HOST"
+# The exporter has no authentication, so it only listens locally unless told otherwise.
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+_started_at = time.time()
+
+
+# --- Shards ---
+class _Shard:
+    """Histograms and counters written by a single thread."""
+    __slots__ = ("thread", "histograms", "counters")
+
+    def __init__(self, thread):
+        self.thread = thread
+        # key -> [count per bucket..., total milliseconds]
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, key, ms):
+        counts = self.histograms.get(key)
+        if counts is None:
+            counts = self.histograms[key] = [0] * (len(BOUNDS_MS) + 2)
+        counts[bisect.bisect_left(BOUNDS_MS, ms)] += 1
+        counts[-1] += ms
+
+    def increment(self, key, amount=1):
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def merge_into(self, target):
+        for key, counts in list(self.histograms.items()):
+            total = target.histograms.setdefault(key, [0] * len(counts))
+            for i, value in enumerate(counts):
+                total[i] += value
+        for key, value in list(self.counters.items()):
+            target.counters[key] = target.counters.get(key, 0) + value
+
+
+_local = threading.local()
+_shards = []
+_retired = _Shard(None)
+_registry_lock = threading.Lock()
+
+# session id -> last rerun start; session id -> start of the rerun in flight.
+# Single dict assignments are atomic, so these need no lock either.
+_sessions = {}
+_in_flight = {}
+# page -> timings of the page's first rerun in this process. setdefault is
+# atomic, so exactly one rerun claims each page's entry.
+_startup = {}
+
+
+def _fold_finished_shards():
+    """Moves shards of finished threads into the retired total. Caller holds the registry lock."""
+    alive = []
+    for shard in _shards:
+        if shard.thread.is_alive():
+            alive.append(shard)
+        else:
+            shard.merge_into(_retired)
+    _shards[:] = alive
+
+
+def _shard():
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = _Shard(threading.current_thread())
+        with _registry_lock:
+            if len(_shards) >= MAX_SHARDS:
+                _fold_finished_shards()
+            _shards.append(shard)
+    return shard
+
+
+# --- Recording ---
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def start_rerun(page, session_id=None):
+    """Marks the start of a page rerun for the current session."""
+    session_id = session_id or _session_id() or threading.get_ident()
+    now = time.time()
+    _local.page = page
+    _local.session_id = session_id
+    _local.rerun_started = time.perf_counter()
+    _local.painted = False
+    entry = {}
+    _local.startup = entry if _startup.setdefault(page, entry) is entry else None
+    _sessions[session_id] = now
+    _in_flight[session_id] = now
+    _shard().increment((page, "reruns"))
+
+
+def first_paint():
+    """Records the time from rerun start to the page's first visible content."""
+    started = getattr(_local, "rerun_started", None)
+    if started is None or _local.painted:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    _local.painted = True
+    _shard().observe((_local.page, "first paint"), ms)
+    if _local.startup is not None:
+        _local.startup.update(process_age_s=process_age(), first_paint_ms=ms)
+
+
+def finish_rerun():
+    """Records the total rerun time of the current page."""
+    started = getattr(_local, "rerun_started", None)
+    if started is None:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    _shard().observe((_local.page, "total rerun"), ms)
+    if _local.startup is not None:
+        _local.startup["rerun_ms"] = ms
+        _local.startup = None
+    _in_flight.pop(_local.session_id, None)
+    _local.rerun_started = None
+
+
+def record_refresh(source=None):
+    """Counts one real data refresh, e.g. a cache miss that regenerates a dataset."""
+    _shard().increment((source or getattr(_local, "page", ""), "data refreshes"))
+
+
+@contextmanager
+def section(name):
+    """Times a named section of the current page."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _shard().observe((getattr(_local, "page", ""), name), (time.perf_counter() - start) * 1000)
+
+
+# --- Reading ---
+def rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def process_age():
+    """Seconds since this process started."""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime, in clock ticks after boot, is the 20th field after the command name.
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.time() - _started_at
+
+
+def total_memory_mb():
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _percentile(counts, q):
+    """Upper bucket bound below which a share `q` of the observations fall."""
+    target = q * sum(counts)
+    running = 0
+    for bound, count in zip(BOUNDS_MS + (float("inf"),), counts):
+        running += count
+        if running >= target:
+            return bound
+    return float("inf")
+
+
+def snapshot():
+    """Merges every shard into one view of the process's metrics."""
+    merged = _Shard(None)
+    with _registry_lock:
+        _fold_finished_shards()
+        _retired.merge_into(merged)
+        for shard in _shards:
+            shard.merge_into(merged)
+
+    now = time.time()
+    for session_id, seen in list(_sessions.items()):
+        if now - seen > ACTIVE_SESSION_WINDOW:
+            _sessions.pop(session_id, None)
+    # Reruns that stopped without finish_rerun (st.stop, an exception, an
+    # interrupted rerun, a dropped session) would otherwise stay forever.
+    for session_id, started in list(_in_flight.items()):
+        if now - started > STALE_RERUN_SECONDS:
+            _in_flight.pop(session_id, None)
+    sections = []
+    for (page, name), counts in sorted(merged.histograms.items()):
+        buckets, total_ms = counts[:-1], counts[-1]
+        count = sum(buckets)
+        sections.append({
+            "page": page, "section": name, "count": count,
+            "mean_ms": total_ms / count if count else 0.0,
+            "p50_ms": _percentile(buckets, 0.5), "p95_ms": _percentile(buckets, 0.95),
+            "p99_ms": _percentile(buckets, 0.99), "buckets": buckets, "sum_ms": total_ms,
+        })
+    reruns = sum(value for (_, name), value in merged.counters.items() if name == "reruns")
+    refreshes = sum(value for (_, name), value in merged.counters.items() if name == "data refreshes")
+    uptime = now - _started_at
+    rss = rss_mb()
+    total = total_memory_mb()
+    return {
+        "uptime_s": uptime,
+        "active_sessions": len(_sessions),
+        "queue_depth": len(_in_flight),
+        "reruns": reruns,
+        "data_refreshes": refreshes,
+        "data_refreshes_per_min": refreshes / uptime * 60 if uptime else 0.0,
+        "rss_mb": rss,
+        "memory_pct": rss / total * 100 if total else None,
+        "sections": sections,
+        "startup": [
+            {"page": page, **entry} for page, entry in sorted(list(_startup.items())) if "first_paint_ms" in entry
+        ],
+    }
+
+
+def prometheus_text(snap=None):
+    """Renders a snapshot in the Prometheus text exposition format."""
+    snap = snap or snapshot()
+    lines = [
+        f"hajj_uptime_seconds {snap['uptime_s']:.1f}",
+        f"hajj_active_sessions {snap['active_sessions']}",
+        f"hajj_queue_depth {snap['queue_depth']}",
+        f"hajj_reruns_total {snap['reruns']}",
+        f"hajj_data_refreshes_total {snap['data_refreshes']}",
+        f"hajj_process_rss_bytes {snap['rss_mb'] * 2 ** 20:.0f}",
+        "# TYPE hajj_section_duration_ms histogram",
+    ]
+    for s in snap["sections"]:
+        labels = f'page="{s["page"]}",section="{s["section"]}"'
+        running = 0
+        for bound, count in zip(BOUNDS_MS + ("+Inf",), s["buckets"]):
+            running += count
+            lines.append(f'hajj_section_duration_ms_bucket{{{labels},le="{bound}"}} {running}')
+        lines.append(f"hajj_section_duration_ms_sum{{{labels}}} {s['sum_ms']:.3f}")
+        lines.append(f"hajj_section_duration_ms_count{{{labels}}} {s['count']}")
+    for entry in snap["startup"]:
+        labels = f'page="{entry["page"]}"'
+        lines.append(f"hajj_cold_start_process_age_seconds{{{labels}}} {entry['process_age_s']:.3f}")
+        lines.append(f"hajj_cold_start_first_paint_ms{{{labels}}} {entry['first_paint_ms']:.3f}")
+        if "rerun_ms" in entry:
+            lines.append(f"hajj_cold_start_rerun_ms{{{labels}}} {entry['rerun_ms']:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Export Endpoint ---
+_exporter = None
+
+
+def start_exporter(port=None, host=None):
+    """
+    Serves /metrics (Prometheus) and /metrics.json on `port`, or on the port in
+    the HAJJ_METRICS_PORT environment variable. Does nothing if neither is set
+    or the exporter is already running. Binds to `host`, HAJJ_METRICS_HOST or
+    127.0.0.1, in that order. Returns the port served, if any.
+    """
+    global _exporter
+    port = port or os.environ.get(METRICS_PORT_ENV)
+    host = host or os.environ.get(METRICS_HOST_ENV) or DEFAULT_METRICS_HOST
+    if not port:
+        return None
+    with _registry_lock:
+        if _exporter is None:
+            # http.server is only needed once exporting is switched on.
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class _MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path == "/metrics":
+                        body, content_type = prometheus_text().encode(), "text/plain; version=0.0.4"
+                    elif self.path == "/metrics.json":
+                        body, content_type = json.dumps(snapshot()).encode(), "application/json"
+                    else:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            _exporter = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_exporter.serve_forever, name="hajj-metrics", daemon=True).start()
+    return _exporter.server_address[1]
@@ -0,0 +1,34 @@
+# hajj/projections.py
+"""Wait-time projections and record filtering behind the dashboard charts."""
+from hajj.scenarios import PROJECTION_TRENDS
+
+# Age bounds for the Advanced Analytics filter, as [lower, upper).
+AGE_GROUPS = {"40-60": (40, 60), "60-70": (60, 70), "70+": (70, None)}
+
+
+def wait_time_projections(start_year=2024, n_years=12):
+    """Projected wait time in years for each scenario, indexed by year."""
+    import numpy as np
+    import pandas as pd
+
+    steps = np.arange(n_years)
+    projections = {'Year': start_year + steps}
+    for scenario, (initial, slope) in PROJECTION_TRENDS.items():
+        projections[scenario] = initial + steps * slope
+    return pd.DataFrame(projections).set_index('Year')
+
+
+def filter_records(df, region="All Regions", age_group="All Ages"):
+    """Filters waitlist records by the Advanced Analytics region and age-group selections."""
+    import numpy as np
+
+    mask = np.ones(len(df), dtype=bool)
+    if region != "All Regions":
+        mask &= (df['Region'] == region).to_numpy()
+    if age_group != "All Ages":
+        low, high = AGE_GROUPS[age_group]
+        age = df['Age'].to_numpy()
+        mask &= age >= low
+        if high is not None:
+            mask &= age < high
+    return df[mask]
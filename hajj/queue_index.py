@@ -0,0 +1,136 @@
+# hajj/queue_index.py
+"""
+Position-in-queue index for the Hajj waitlist.
+
+Depositors are queued by registration date. The index keeps a Fenwick
+(binary indexed) tree of account counts per registration day, so a
+depositor's rank, a new registration and a withdrawal are all O(log n).
+Accounts registered on the same day share a position, since the queue does
+not order them any further.
+"""
+import numpy as np
+
+from hajj.scenarios import CURRENT_QUOTA as DEFAULT_QUOTA
+
+DEFAULT_START_YEAR = 2025
+
+
+def _to_day(date):
+    return np.datetime64(date, "D")
+
+
+class WaitlistIndex:
+    """Order-statistic index over the waitlist, bucketed by registration day."""
+
+    def __init__(self, start_date="1963-01-01", end_date="2100-12-31"):
+        self._origin = _to_day(start_date)
+        self._size = int((_to_day(end_date) - self._origin).astype(int)) + 1
+        self._tree = [0] * (self._size + 1)
+        self._counts = np.zeros(self._size, dtype=np.int64)
+        self._bucket_of = {}
+
+    @classmethod
+    def from_frame(cls, df, account_col="accountID", date_col="registration_date", **kwargs):
+        """Builds an index from a DataFrame of accounts in O(n + buckets)."""
+        import pandas as pd
+
+        index = cls(**kwargs)
+        days = pd.to_datetime(df[date_col]).to_numpy("datetime64[D]")
+        buckets = (days - index._origin).astype(np.int64)
+        index._check_buckets(buckets)
+        accounts = df[account_col].tolist()
+        index._bucket_of = dict(zip(accounts, buckets.tolist()))
+        if len(index._bucket_of) != len(accounts):
+            raise ValueError("Duplicate account IDs in waitlist.")
+        index._counts = np.bincount(buckets, minlength=index._size).astype(np.int64)
+        index._rebuild_tree()
+        return index
+
+    def _check_buckets(self, buckets):
+        if np.any((buckets < 0) | (buckets >= self._size)):
+            raise ValueError("Registration date is outside the index range.")
+
+    def _rebuild_tree(self):
+        # Linear-time Fenwick construction: push each node's total to its parent.
+        tree = [0] + self._counts.tolist()
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _update(self, bucket, delta):
+        self._counts[bucket] += delta
+        i = bucket + 1
+        tree, size = self._tree, self._size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def _ahead_of(self, bucket):
+        """Accounts registered strictly before `bucket`."""
+        total, i, tree = 0, bucket, self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    # --- Updates ---
+    def __len__(self):
+        return len(self._bucket_of)
+
+    def __contains__(self, account_id):
+        return account_id in self._bucket_of
+
+    def add(self, account_id, registration_date):
+        """Registers a new account on the waitlist."""
+        if account_id in self._bucket_of:
+            raise ValueError(f"Account {account_id} is already on the waitlist.")
+        bucket = int((_to_day(registration_date) - self._origin).astype(int))
+        self._check_buckets(np.array([bucket]))
+        self._bucket_of[account_id] = bucket
+        self._update(bucket, 1)
+
+    def withdraw(self, account_id):
+        """Removes an account from the waitlist (withdrawal or departure)."""
+        bucket = self._bucket_of.pop(account_id)
+        self._update(bucket, -1)
+
+    # --- Lookups ---
+    def position(self, account_id):
+        """1-based queue position of an account."""
+        return self._ahead_of(self._bucket_of[account_id]) + 1
+
+    def positions(self, account_ids):
+        """Vectorized queue positions for many accounts, e.g. for exports."""
+        buckets = np.fromiter(map(self._bucket_of.__getitem__, account_ids), dtype=np.int64)
+        ahead = np.concatenate([[0], np.cumsum(self._counts)])
+        return ahead[buckets] + 1
+
+    def departure_year(self, account_id, quota=DEFAULT_QUOTA, start_year=DEFAULT_START_YEAR):
+        """
+        Estimated departure year for an account. `quota` is either a fixed
+        annual quota or a list of quotas from `start_year` onwards, with the
+        last value carried forward.
+        """
+        ahead = self._ahead_of(self._bucket_of[account_id])
+        if np.ndim(quota) == 0:
+            return start_year + ahead // quota
+        return int(departure_years_for(np.array([ahead]), quota, start_year)[0])
+
+    def departure_years(self, account_ids, quota=DEFAULT_QUOTA, start_year=DEFAULT_START_YEAR):
+        """Vectorized departure years for many accounts."""
+        return departure_years_for(self.positions(account_ids) - 1, quota, start_year)
+
+
+def departure_years_for(ahead, quota, start_year=DEFAULT_START_YEAR):
+    """Departure years for depositors with `ahead` accounts in front of them."""
+    ahead = np.asarray(ahead, dtype=np.int64)
+    if np.ndim(quota) == 0:
+        return start_year + ahead // quota
+    quotas = np.asarray(quota, dtype=np.int64)
+    filled = np.cumsum(quotas)
+    years = np.searchsorted(filled, ahead, side="right")
+    beyond = years >= quotas.size
+    overflow = (ahead - filled[-1]) // quotas[-1]
+    return start_year + np.where(beyond, quotas.size + overflow, years)
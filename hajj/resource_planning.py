@@ -0,0 +1,262 @@
+# hajj/resource_planning.py
+"""
+Resource planning optimizer: assigns a season's pilgrims to flight batches
+and accommodation blocks.
+
+Pilgrims are aggregated by (region, medical needs) and the assignment is
+solved as two min-cost-flow problems over sparse node-arc incidence
+matrices:
+
+1. pilgrim groups -> flight batches, respecting each region's permitted
+   departure airports, flight capacity and medical seats;
+2. (flight, medical) loads -> accommodation blocks, respecting block
+   capacity, medical beds and the block's check-in window.
+
+Network matrices are totally unimodular, so a vertex solution of the LP is
+integral. The aggregated flows are then expanded back to one row per
+pilgrim, which keeps a full 31,600-pilgrim season well under a second.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+# Departure airports each region may use, with a per-pilgrim routing cost.
+# The first airport listed is the region's home airport.
+DEPARTURE_AIRPORTS = {
+    "KUL": {"KUL": 0}, "SEL": {"KUL": 0}, "SGR": {"KUL": 0}, "PJY": {"KUL": 0},
+    "NSN": {"KUL": 0}, "MEL": {"KUL": 0, "JHB": 2},
+    "PHG": {"KUL": 0, "KBR": 2}, "PRK": {"KUL": 0, "PEN": 1},
+    "KED": {"PEN": 0, "KUL": 2}, "PEN": {"PEN": 0, "KUL": 2}, "PLS": {"PEN": 0, "KUL": 3},
+    "KTN": {"KBR": 0, "KUL": 3}, "TRG": {"KBR": 0, "KUL": 3},
+    "JHR": {"JHB": 0, "KUL": 2},
+    "SBH": {"BKI": 0}, "SWK": {"KCH": 0},
+}
+
+# Health statuses that require medical seats on flights and medical beds in accommodation.
+MEDICAL_HEALTH = ["Fair", "Poor"]
+
+# Cost of leaving a pilgrim unassigned; keeps every problem feasible while
+# dominating any real routing or accommodation cost.
+UNASSIGNED_COST = 1e6
+
+
+def _check_regions(regions):
+    """Raises ValueError for regions without permitted departure airports."""
+    unknown = sorted(set(regions) - set(DEPARTURE_AIRPORTS))
+    if unknown:
+        raise ValueError(f"No departure airports configured for region(s): {', '.join(map(str, unknown))}")
+
+
+# --- Solver ---
+def min_cost_flow(tails, heads, capacity, cost, supply):
+    """
+    Solves a min-cost-flow problem given as arc arrays and a node supply vector
+    (positive = source, negative = sink, summing to zero). Returns the integral
+    flow on each arc.
+    """
+    tails, heads = np.asarray(tails), np.asarray(heads)
+    n_arcs = tails.size
+    arcs = np.arange(n_arcs)
+    incidence = sparse.csr_matrix(
+        (np.r_[np.ones(n_arcs), -np.ones(n_arcs)], (np.r_[tails, heads], np.r_[arcs, arcs])),
+        shape=(len(supply), n_arcs),
+    )
+    bounds = np.column_stack([np.zeros(n_arcs), np.asarray(capacity, dtype=float)])
+    result = linprog(cost, A_eq=incidence, b_eq=supply, bounds=bounds, method="highs-ds")
+    if result.status != 0:
+        raise RuntimeError(f"Min-cost flow failed: {result.message}")
+    return np.rint(result.x).astype(np.int64)
+
+
+def _expand(pilgrim_keys, arc_keys, arc_targets, arc_flows):
+    """
+    Hands out each key's pilgrims to the arc targets leaving that key, in
+    proportion to the arc flows. Returns the target for every pilgrim.
+    """
+    order = np.argsort(pilgrim_keys, kind="stable")
+    arc_order = np.argsort(arc_keys, kind="stable")
+    targets = np.empty(len(pilgrim_keys), dtype=np.int64)
+    targets[order] = np.repeat(arc_targets[arc_order], arc_flows[arc_order])
+    return targets
+
+
+# --- Stage 1: Pilgrims to Flights ---
+def _assign_flights(region_codes, regions, medical, flights):
+    n_groups = len(regions) * 2
+    group_of = region_codes * 2 + medical
+    group_size = np.bincount(group_of, minlength=n_groups)
+
+    n_flights = len(flights)
+    flight_airport = flights["airport"].to_numpy()
+    med_node = n_groups + np.arange(n_flights)
+    flight_node = n_groups + n_flights + np.arange(n_flights)
+    sink = n_groups + 2 * n_flights
+
+    tails, heads, caps, costs, arc_group, arc_flight = [], [], [], [], [], []
+
+    def add(tail, head, cap, cost, group=-1, flight=-1):
+        tails.append(tail); heads.append(head); caps.append(cap); costs.append(cost)
+        arc_group.append(group); arc_flight.append(flight)
+
+    for r, region in enumerate(regions):
+        for airport, routing_cost in DEPARTURE_AIRPORTS[region].items():
+            for f in np.flatnonzero(flight_airport == airport):
+                add(2 * r, flight_node[f], np.inf, routing_cost + flights["cost"].iat[f], 2 * r, f)
+                add(2 * r + 1, med_node[f], np.inf, routing_cost + flights["cost"].iat[f], 2 * r + 1, f)
+    for g in range(n_groups):
+        add(g, sink, np.inf, UNASSIGNED_COST, g, -1)
+    for f in range(n_flights):
+        add(med_node[f], flight_node[f], flights["medical_seats"].iat[f], 0)
+        add(flight_node[f], sink, flights["capacity"].iat[f], 0)
+
+    supply = np.zeros(sink + 1)
+    supply[:n_groups] = group_size
+    supply[sink] = -group_size.sum()
+    flow = min_cost_flow(tails, heads, caps, costs, supply)
+
+    arc_group, arc_flight = np.array(arc_group), np.array(arc_flight)
+    pilgrim_arcs = arc_group >= 0
+    return _expand(group_of, arc_group[pilgrim_arcs], arc_flight[pilgrim_arcs], flow[pilgrim_arcs])
+
+
+# --- Stage 2: Flight Loads to Accommodation ---
+def _assign_blocks(flight_of, medical, flights, blocks):
+    n_flights, n_blocks = len(flights), len(blocks)
+    assigned = flight_of >= 0
+    load_of = np.where(assigned, flight_of * 2 + medical, 2 * n_flights)
+    load_size = np.bincount(load_of, minlength=2 * n_flights + 1)[: 2 * n_flights]
+
+    n_loads = 2 * n_flights
+    med_node = n_loads + np.arange(n_blocks)
+    block_node = n_loads + n_blocks + np.arange(n_blocks)
+    sink = n_loads + 2 * n_blocks
+
+    flight_date = flights["date"].to_numpy()
+    check_in, check_out = blocks["check_in"].to_numpy(), blocks["check_out"].to_numpy()
+    block_cost = blocks["cost"].to_numpy(dtype=float)
+    fits = (check_in[None, :] <= flight_date[:, None]) & (flight_date[:, None] <= check_out[None, :])
+    f_idx, b_idx = np.nonzero(fits)
+
+    load_tails = np.r_[f_idx * 2, f_idx * 2 + 1, np.arange(n_loads)]
+    load_heads = np.r_[block_node[b_idx], med_node[b_idx], np.full(n_loads, sink)]
+    load_targets = np.r_[b_idx, b_idx, np.full(n_loads, -1)]
+    tails = np.r_[load_tails, med_node, block_node]
+    heads = np.r_[load_heads, block_node, np.full(n_blocks, sink)]
+    caps = np.r_[np.full(load_tails.size, np.inf), blocks["medical_beds"].to_numpy(float), blocks["capacity"].to_numpy(float)]
+    costs = np.r_[block_cost[b_idx], block_cost[b_idx], np.full(n_loads, UNASSIGNED_COST), np.zeros(2 * n_blocks)]
+
+    supply = np.zeros(sink + 1)
+    supply[:n_loads] = load_size
+    supply[sink] = -load_size.sum()
+    flow = min_cost_flow(tails, heads, caps, costs, supply)
+
+    block_of = np.full(flight_of.size, -1, dtype=np.int64)
+    block_of[assigned] = _expand(load_of[assigned], load_tails, load_targets, flow[: load_tails.size])
+    return block_of
+
+
+def _medical_mask(pilgrims):
+    if "medical" in pilgrims:
+        return pilgrims["medical"].to_numpy(dtype=bool)
+    return pilgrims["health"].isin(MEDICAL_HEALTH).to_numpy()
+
+
+def plan_season(pilgrims, flights, blocks):
+    """
+    Assigns every pilgrim to a flight batch and an accommodation block.
+
+    `pilgrims` needs `region` and either a boolean `medical` column or a
+    `health` column; `flights` needs `flight_id`, `airport`, `date`,
+    `capacity`, `medical_seats` and `cost`; `blocks` needs `block_id`,
+    `check_in`, `check_out`, `capacity`, `medical_beds` and `cost`.
+    Returns a copy of `pilgrims` with `flight_id` and `block_id` columns
+    (missing where capacity ran out) and a summary dict. Raises ValueError
+    for regions missing from DEPARTURE_AIRPORTS.
+    """
+    medical = _medical_mask(pilgrims).astype(np.int64)
+    region_codes, regions = pd.factorize(pilgrims["region"])
+    _check_regions(regions)
+    flights = flights.reset_index(drop=True)
+    blocks = blocks.reset_index(drop=True)
+
+    flight_of = _assign_flights(region_codes, list(regions), medical, flights)
+    block_of = _assign_blocks(flight_of, medical, flights, blocks)
+
+    plan = pilgrims.copy()
+    plan["flight_id"] = flights["flight_id"].reindex(flight_of).to_numpy()
+    plan["block_id"] = blocks["block_id"].reindex(block_of).to_numpy()
+    on_flight = flight_of >= 0
+    housed = block_of >= 0
+    summary = {
+        "pilgrims": len(plan),
+        "assigned_flight": int(on_flight.sum()),
+        "assigned_block": int(housed.sum()),
+        "unassigned": int((~housed).sum()),
+        "flight_utilisation": float(on_flight.sum() / flights["capacity"].sum()) if len(flights) else 0.0,
+        "block_utilisation": float(housed.sum() / blocks["capacity"].sum()) if len(blocks) else 0.0,
+    }
+    return plan, summary
+
+
+# --- Schedule Builder ---
+def build_schedule(pilgrims, start_date="2025-05-01", days=30, flight_capacity=400,
+                   medical_share=None, block_capacity=2000, block_days=7, slack=0.05, verify=True):
+    """
+    Builds flight batches and accommodation blocks sized for `pilgrims`, so a
+    quota scenario can be planned without a hand-made schedule. Flights are
+    spread evenly over `days` from each home airport; accommodation blocks
+    accept arrivals in overlapping windows of `block_days`, and each window
+    gets enough beds and medical beds for the flight seats arriving in it.
+    Medical seats default to each airport's own medical demand plus `slack`.
+
+    With `verify`, the schedule is planned once and a RuntimeError is raised
+    if any pilgrim is left without a flight or a block.
+    """
+    start = pd.Timestamp(start_date)
+    _check_regions(pilgrims["region"].unique())
+    medical = _medical_mask(pilgrims)
+    home_airport = pilgrims["region"].map(lambda r: next(iter(DEPARTURE_AIRPORTS[r])))
+    demand = home_airport.value_counts()
+    medical_demand = pd.Series(medical, index=pilgrims.index).groupby(home_airport).sum()
+
+    flight_rows = []
+    for airport, count in demand.items():
+        n = int(np.ceil(count * (1 + slack) / flight_capacity))
+        if medical_share is None:
+            medical_seats = min(flight_capacity, int(np.ceil(medical_demand[airport] * (1 + slack) / n)))
+        else:
+            medical_seats = int(flight_capacity * medical_share)
+        offsets = np.linspace(0, days - 1, n).round().astype(int)
+        for i, offset in enumerate(offsets):
+            flight_rows.append({
+                "flight_id": f"{airport}-{i + 1:03d}", "airport": airport,
+                "date": start + pd.Timedelta(days=int(offset)), "capacity": flight_capacity,
+                "medical_seats": medical_seats, "cost": 0.0,
+            })
+    flights = pd.DataFrame(flight_rows)
+
+    # Each window houses the seats of the flights landing from its check-in
+    # day until the next window opens.
+    window_of = ((flights["date"] - start).dt.days // block_days).to_numpy()
+    n_windows = int(np.ceil(days / block_days))
+    seats = np.bincount(window_of, weights=flights["capacity"], minlength=n_windows)
+    medical_seats = np.bincount(window_of, weights=flights["medical_seats"], minlength=n_windows)
+    block_rows = []
+    for w in range(n_windows):
+        n_blocks = int(np.ceil(seats[w] / block_capacity))
+        for i in range(n_blocks):
+            block_rows.append({
+                "block_id": f"BLK-{w + 1:02d}{chr(ord('A') + i % 26)}{i // 26 or ''}",
+                "check_in": start + pd.Timedelta(days=w * block_days),
+                "check_out": start + pd.Timedelta(days=min(days, (w + 1) * block_days + 1) - 1),
+                "capacity": block_capacity, "medical_beds": int(np.ceil(medical_seats[w] / n_blocks)),
+                "cost": float(i),
+            })
+    blocks = pd.DataFrame(block_rows)
+
+    if verify:
+        _, summary = plan_season(pilgrims, flights, blocks)
+        if summary["unassigned"]:
+            raise RuntimeError(f"Schedule leaves {summary['unassigned']:,} of {summary['pilgrims']:,} pilgrims unassigned")
+    return flights, blocks
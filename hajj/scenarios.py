@@ -0,0 +1,24 @@
+# hajj/scenarios.py
+"""Quota scenarios shown on the Strategic Dashboard and used by the projection engines."""
+
+CURRENT_QUOTA = 31600
+
+SCENARIOS = [
+    {"title": "Current Trajectory", "status": "Critical", "quota": CURRENT_QUOTA, "wait_time": "150+ years", "desc": "Waitlist continues to grow exponentially with current demographics."},
+    {"title": "Moderate Improvement", "status": "Moderate", "quota": 36600, "wait_time": "98 years", "desc": "Modest reduction but still challenging timeline."},
+    {"title": "Significant Change", "status": "Improvement", "quota": 41600, "wait_time": "67 years", "desc": "Substantial improvement in wait times."},
+    {"title": "Optimal Solution", "status": "Optimal", "quota": 45600, "wait_time": "45 years", "desc": "Best case scenario with manageable wait times."}
+]
+
+# Linear wait-time trends per quota scenario: (wait in the first year, change per year).
+PROJECTION_TRENDS = {
+    'Current Trajectory': (142, 2.8),
+    'Moderate (+5K Quota)': (140, -3.5),
+    'Significant (+10K Quota)': (140, -6.1),
+    'Optimal (+15K Quota)': (140, -8),
+}
+
+
+def scenario_quotas():
+    """Annual quota for each scenario, keyed by title."""
+    return {scenario["title"]: scenario["quota"] for scenario in SCENARIOS}
@@ -0,0 +1,137 @@
+# hajj/scoring.py
+"""
+Offer-acceptance scoring used by the Classification Engine.
+
+`predict_acceptance` scores one candidate and explains the factors behind
+the score; `predict_acceptance_batch` applies the same rules to whole
+columns at once for tables and exports, and `sensitivity_grid` scores every
+age, salary and deferment combination around a candidate in one call.
+
+numpy and pandas are imported inside the batch functions, so workers that
+only score single candidates never load them.
+"""
+GOOD_HEALTH = ["Excellent", "Good"]
+ACCEPT = "Likely to Accept"
+DECLINE = "Likely to Decline"
+
+HEALTH_LEVELS = ["Excellent", "Good", "Fair", "Poor"]
+OCCUPATIONS = ["Government", "Private", "Self-Employed", "Retired"]
+
+# Axes of the what-if grid, matching the prediction form's input ranges.
+GRID_AGES = (20, 90, 1)
+GRID_SALARIES = (1000, 30000, 500)
+GRID_DEFERMENTS = (0, 10, 1)
+
+
+# --- Mock Prediction Function ---
+def predict_acceptance(features):
+    """
+    A mock prediction function that returns a prediction, confidence score,
+    and a list of factors based on simple rules.
+    """
+    score = 50
+    factors = []
+    if 40 <= features['age'] <= 60:
+        score += 15
+        factors.append("✅ **Positive Factor**: Candidate is within the prime age range for performing Hajj.")
+    elif features['age'] > 70:
+        score -= 10
+        factors.append("⚠️ **Negative Factor**: Advanced age might pose health challenges.")
+    if features['salary'] >= 5000:
+        score += 20
+        factors.append("✅ **Positive Factor**: Strong financial capacity indicated by salary.")
+    elif features['salary'] < 3000:
+        score -= 15
+        factors.append("⚠️ **Negative Factor**: Lower salary might indicate financial constraints.")
+    if features['health'] == "Excellent" or features['health'] == "Good":
+        score += 25
+        factors.append("✅ **Positive Factor**: Good health status is crucial for Hajj.")
+    else:
+        score -= 25
+        factors.append("⚠️ **Negative Factor**: Fair or Poor health is a significant barrier.")
+    if features['deferments'] > 0:
+        score -= (features['deferments'] * 10)
+        factors.append(f"⚠️ **Negative Factor**: Candidate has deferred {features['deferments']} time(s) before.")
+    else:
+        score += 10
+        factors.append("✅ **Positive Factor**: No previous deferments suggests strong intention.")
+    if features['dependents'] > 3:
+        score -= 10
+        factors.append("⚠️ **Negative Factor**: High number of dependents may impact readiness.")
+    confidence = max(0, min(100, score))
+    if confidence >= 50:
+        prediction = ACCEPT
+    else:
+        prediction = DECLINE
+    return prediction, confidence, factors
+
+
+def _confidence(age, salary, good_health, deferments, dependents):
+    """The rules of `predict_acceptance` on arrays; inputs broadcast against each other."""
+    import numpy as np
+
+    deferments = np.asarray(deferments, dtype=np.int64)
+    score = 50 + np.where((age >= 40) & (age <= 60), 15, np.where(age > 70, -10, 0))
+    score = score + np.where(salary >= 5000, 20, np.where(salary < 3000, -15, 0))
+    score = score + np.where(good_health, 25, -25)
+    score = score + np.where(deferments > 0, -10 * deferments, 10)
+    score = score - np.where(dependents > 3, 10, 0)
+    return score.clip(0, 100)
+
+
+def predict_acceptance_batch(df):
+    """
+    Vectorized version of `predict_acceptance` for a DataFrame with `age`,
+    `salary`, `health`, `deferments` and `dependents` columns. Returns the
+    prediction and confidence arrays.
+    """
+    import numpy as np
+
+    confidence = _confidence(
+        df['age'].to_numpy(), df['salary'].to_numpy(), df['health'].isin(GOOD_HEALTH).to_numpy(),
+        df['deferments'].to_numpy(), df['dependents'].to_numpy(),
+    )
+    prediction = np.array([DECLINE, ACCEPT], dtype=object)[(confidence >= 50).astype(np.int8)]
+    return prediction, confidence
+
+
+def sensitivity_grid(health, dependents, ages=GRID_AGES, salaries=GRID_SALARIES, deferments=GRID_DEFERMENTS):
+    """
+    Confidence for every (deferments, salary, age) combination with health and
+    dependents held fixed, scored in one broadcast call. Each axis is an
+    inclusive (start, stop, step) range. Returns the age, salary and deferment
+    values and a confidence array of shape (deferments, salaries, ages).
+    """
+    import numpy as np
+
+    age_values = np.arange(ages[0], ages[1] + 1, ages[2])
+    salary_values = np.arange(salaries[0], salaries[1] + 1, salaries[2])
+    deferment_values = np.arange(deferments[0], deferments[1] + 1, deferments[2])
+    confidence = _confidence(
+        age_values[None, None, :], salary_values[None, :, None], health in GOOD_HEALTH,
+        deferment_values[:, None, None], dependents,
+    )
+    shape = (len(deferment_values), len(salary_values), len(age_values))
+    return age_values, salary_values, deferment_values, np.broadcast_to(confidence, shape)
+
+
+def generate_sample_data(size=200, seed=None):
+    """Generates a sample DataFrame and runs predictions on it."""
+    import numpy as np
+    import pandas as pd
+
+    # Draw codes and look them up in object arrays, one step per column.
+    health_levels = np.array(HEALTH_LEVELS, dtype=object)
+    occupations = np.array(OCCUPATIONS, dtype=object)
+    rng = np.random.default_rng(seed)
+    data = {
+        'age': rng.integers(30, 80, size=size),
+        'salary': rng.integers(2500, 15000, size=size),
+        'dependents': rng.integers(0, 9, size=size),
+        'health': health_levels[rng.choice(4, size=size, p=[0.4, 0.4, 0.1, 0.1])],
+        'occupation': occupations[rng.integers(0, 4, size=size)],
+        'deferments': rng.choice([0, 1, 2], size=size, p=[0.7, 0.2, 0.1]),
+    }
+    sample_df = pd.DataFrame(data)
+    sample_df['Prediction'], _ = predict_acceptance_batch(sample_df)
+    return sample_df
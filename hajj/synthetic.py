@@ -0,0 +1,139 @@
+# hajj/synthetic.py
+"""
+Synthetic depositor generator for load testing and engine development.
+
+Rows follow configurable marginal distributions (the dashboard's age bands,
+regional shares, health and deferment probabilities) and are generated in
+shards. Each shard draws from its own random stream spawned from a single
+seed, so the same seed and shard size always produce the same data, and
+shards can be written to Parquet or Arrow files in parallel.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Marginal distributions. Age bands follow the Demographics Breakdown pie
+# on the Strategic Dashboard; regional shares are approximate population shares.
+DEFAULT_MARGINALS = {
+    "age_bands": {(40, 50): 0.25, (50, 60): 0.28, (60, 70): 0.12, (70, 90): 0.35},
+    "regions": {
+        "SGR": 0.20, "JHR": 0.12, "SWK": 0.08, "SBH": 0.08, "PRK": 0.08, "KED": 0.07,
+        "KUL": 0.06, "KTN": 0.06, "PEN": 0.05, "PHG": 0.05, "TRG": 0.04, "NSN": 0.04,
+        "MEL": 0.03, "SEL": 0.02, "PLS": 0.01, "PJY": 0.01,
+    },
+    "health": {"Excellent": 0.4, "Good": 0.4, "Fair": 0.1, "Poor": 0.1},
+    "occupation": {"Government": 0.3, "Private": 0.35, "Self-Employed": 0.15, "Retired": 0.2},
+    "deferments": {0: 0.7, 1: 0.2, 2: 0.1},
+    "dependents": {"max": 5},
+    "salary": {"median": 4500, "sigma": 0.6, "min": 1000, "max": 30000},
+}
+
+FIRST_ACCOUNT_ID = 10_000_000
+REFERENCE_DATE = "2025-01-01"
+DEFAULT_SHARD_ROWS = 1_000_000
+
+
+def _choice(rng, distribution, size):
+    """Draws category codes for a {value: probability} mapping."""
+    probabilities = np.fromiter(distribution.values(), dtype=float)
+    cumulative = np.cumsum(probabilities / probabilities.sum())
+    return np.searchsorted(cumulative, rng.random(size), side="right").clip(max=len(cumulative) - 1)
+
+
+def generate_columns(n_rows, rng, marginals=DEFAULT_MARGINALS, first_row=0):
+    """
+    Generates one shard as a dict of numpy arrays. Categorical columns are
+    returned as (codes, categories) pairs so writers can store them as
+    dictionary-encoded columns without building Python strings per row.
+    """
+    bands = list(marginals["age_bands"])
+    band = _choice(rng, marginals["age_bands"], n_rows)
+    low = np.array([b[0] for b in bands])[band]
+    high = np.array([b[1] for b in bands])[band]
+    age = (low + rng.random(n_rows) * (high - low)).astype(np.int16)
+
+    salary_cfg = marginals["salary"]
+    salary = rng.lognormal(np.log(salary_cfg["median"]), salary_cfg["sigma"], n_rows)
+    salary = salary.clip(salary_cfg["min"], salary_cfg["max"]).round(-1).astype(np.int32)
+
+    # Registered between age 18 and today, at most 60 years ago.
+    years_registered = rng.random(n_rows) * np.minimum(age - 18, 60)
+    registration_date = np.datetime64(REFERENCE_DATE, "D") - (years_registered * 365.25).astype("timedelta64[D]")
+
+    deferment_values = np.array(list(marginals["deferments"]), dtype=np.int8)
+    return {
+        "accountID": np.arange(FIRST_ACCOUNT_ID + first_row, FIRST_ACCOUNT_ID + first_row + n_rows, dtype=np.int64),
+        "region": (_choice(rng, marginals["regions"], n_rows), list(marginals["regions"])),
+        "age": age,
+        "salary": salary,
+        "dependents": rng.integers(0, marginals["dependents"]["max"] + 1, n_rows, dtype=np.int8),
+        "health": (_choice(rng, marginals["health"], n_rows), list(marginals["health"])),
+        "occupation": (_choice(rng, marginals["occupation"], n_rows), list(marginals["occupation"])),
+        "deferments": deferment_values[_choice(rng, marginals["deferments"], n_rows)],
+        "registration_date": registration_date,
+    }
+
+
+def _shard_plan(n_rows, shard_rows, seed):
+    n_shards = max(1, -(-n_rows // shard_rows))
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    return [
+        (i, i * shard_rows, min(shard_rows, n_rows - i * shard_rows), seeds[i])
+        for i in range(n_shards)
+    ]
+
+
+def generate_depositors(n_rows, seed=0, marginals=DEFAULT_MARGINALS, shard_rows=DEFAULT_SHARD_ROWS):
+    """Generates depositors in memory as a pandas DataFrame with categorical columns."""
+    import pandas as pd
+
+    frames = []
+    for _, first_row, rows, shard_seed in _shard_plan(n_rows, shard_rows, seed):
+        columns = generate_columns(rows, np.random.default_rng(shard_seed), marginals, first_row)
+        frames.append(pd.DataFrame({
+            name: pd.Categorical.from_codes(values[0], values[1]) if isinstance(values, tuple) else values
+            for name, values in columns.items()
+        }))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def _to_arrow(columns):
+    import pyarrow as pa
+
+    arrays = {
+        name: pa.DictionaryArray.from_arrays(values[0].astype(np.int8), values[1]) if isinstance(values, tuple) else pa.array(values)
+        for name, values in columns.items()
+    }
+    return pa.table(arrays)
+
+
+def _write_shard(task):
+    path, file_format, marginals, (index, first_row, rows, shard_seed) = task
+    table = _to_arrow(generate_columns(rows, np.random.default_rng(shard_seed), marginals, first_row))
+    shard_path = os.path.join(path, f"part-{index:05d}.{file_format}")
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, shard_path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, shard_path)
+    return shard_path
+
+
+def write_dataset(path, n_rows, seed=0, marginals=DEFAULT_MARGINALS, shard_rows=DEFAULT_SHARD_ROWS,
+                  file_format="parquet", max_workers=None):
+    """
+    Writes `n_rows` depositors as sharded Parquet ("parquet") or Arrow IPC
+    ("arrow") files under `path`, generating shards across a process pool.
+    Returns the shard paths in order.
+    """
+    if file_format not in ("parquet", "arrow"):
+        raise ValueError(f"Unsupported file format: {file_format!r}")
+    os.makedirs(path, exist_ok=True)
+    tasks = [(path, file_format, marginals, shard) for shard in _shard_plan(n_rows, shard_rows, seed)]
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        return [_write_shard(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_write_shard, tasks))
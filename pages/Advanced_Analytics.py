@@ -1,87 +1,16 @@
 # pages/2_Advanced_Analytics.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import app_shell
+from hajj import instrumentation
+from hajj.projections import filter_records
 
 # --- Page Configuration ---
 st.set_page_config(page_title="Advanced Analytics", layout="wide", page_icon="🔬")
-
-# --- Custom CSS for Tabung Haji Theme ---
-def apply_custom_theme():
-    """Applies a custom CSS theme to the Streamlit app."""
-    custom_css = """
-    <style>
-        /* Main colors */
-        :root {
-            --primary-color: #014034; /* Dark Green from TH */
-            --secondary-color: #04d61d; /* Lighter Green for buttons */
-            --background-color: #F0F2F6; /* Light gray background */
-            --text-color: #262730;
-            --secondary-text-color: #FFFFFF;
-        }
-
-        /* General app styling */
-        .stApp {
-            background-color: var(--background-color);
-        }
-
-        /* Sidebar styling */
-        [data-testid="stSidebar"] {
-            background-color: var(--secondary-color);
-        }
-        
-        /* CORRECTED: This targets all text and links within the sidebar nav items */
-        [data-testid="stSidebar"] .st-emotion-cache-16txtl3 a,
-        [data-testid="stSidebar"] .st-emotion-cache-16txtl3 {
-            color: var(--secondary-text-color);
-        }
-
-
-        /* Button styling */
-        .stButton>button {
-            color: var(--secondary-text-color);
-            background-color: var(--secondary-color);
-            border: none;
-            border-radius: 4px;
-        }
-        .stButton>button:hover {
-            background-color: #27AE60; /* Slightly lighter green on hover */
-            color: var(--secondary-text-color);
-        }
-
-        /* Metric styling */
-        [data-testid="stMetric"] {
-            background-color: #FFFFFF;
-            border-radius: 8px;
-            padding: 15px;
-            border: 1px solid #E0E0E0;
-        }
-
-        /* Alert boxes */
-        [data-testid="stAlert"] {
-            border-radius: 8px;
-        }
-
-        /* Progress bar styling */
-        [data-testid="stProgressBar"] > div > div > div > div {
-            background-color: var(--secondary-color);
-        }
-    </style>
-    """
-    st.markdown(custom_css, unsafe_allow_html=True)
-
-apply_custom_theme()
-
-# --- Sidebar ---
-with st.sidebar:
-    # --- Add Tabung Haji Logo ---
-    # Make sure you have a 'logo.png' file in the main app directory
-    try:
-        st.image("logo.png", use_container_width=True)
-    except Exception as e:
-        st.write("Place your logo.png file in the main app directory")
+app_shell.start_page("Advanced Analytics")
 
 st.title("🔬 Advanced Analytics & ML Models")
+instrumentation.first_paint()
 
 # --- Age Distribution & ML Performance ---
 with st.container(border=True):
@@ -94,11 +23,14 @@ with st.container(border=True):
             'Depositors (in thousands)': [320, 700, 920, 750, 600, 450]
         }
         df_age = pd.DataFrame(age_data)
-        fig_age = px.area(df_age, x='Age Group', y='Depositors (in thousands)',
-                          labels={'Depositors (in thousands)': 'Number of Depositors (K)'},
-                          color_discrete_sequence=['#1D8348'])
-        fig_age.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_age, use_container_width=True)
+        with instrumentation.section("figure build"):
+            px = app_shell.plotly_express()
+            fig_age = px.area(df_age, x='Age Group', y='Depositors (in thousands)',
+                              labels={'Depositors (in thousands)': 'Number of Depositors (K)'},
+                              color_discrete_sequence=['#1D8348'])
+            fig_age.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        with instrumentation.section("chart render"):
+            st.plotly_chart(fig_age, use_container_width=True)
 
     with col2:
         st.subheader("ML Model Performance")
@@ -138,11 +70,12 @@ with st.container(border=True):
     with filter_col2:
         age_group = st.selectbox("Filter by Age Group", ["All Ages", "40-60", "60-70", "70+"])
 
-    if region != "All Regions":
-        df_interactive = df_interactive[df_interactive['Region'] == region]
+    with instrumentation.section("filter"):
+        df_filtered = filter_records(df_interactive, region, age_group)
 
-    st.dataframe(df_interactive, hide_index=True, use_container_width=True)
-    st.caption("Showing 5 of 5 records")
+    with instrumentation.section("dataframe render"):
+        st.dataframe(df_filtered, hide_index=True, use_container_width=True)
+    st.caption(f"Showing {len(df_filtered)} of {len(df_interactive)} records")
 
 st.divider()
 
@@ -153,4 +86,6 @@ with st.container(border=True):
     outlier_col1, outlier_col2, outlier_col3 = st.columns(3)
     outlier_col1.metric("Wait Time Outliers", "127 cases", "Depositors with 200+ year projections")
     outlier_col2.metric("Age Anomalies", "43 cases", "Registrations under legal age")
-    outlier_col3.metric("Geographic Clusters", "12 regions", "Areas with unusual concentration")
\ No newline at end of file
+    outlier_col3.metric("Geographic Clusters", "12 regions", "Areas with unusual concentration")
+
+instrumentation.finish_rerun()
\ No newline at end of file
@@ -2,86 +2,27 @@
 import streamlit as st
 import pandas as pd
 import time
+import app_shell
+from hajj import instrumentation
+from hajj.data_quality import ingest_frame, score_for
+from hajj.synthetic import generate_depositors
 
 # --- Page Configuration ---
 st.set_page_config(page_title="System Status & Implementation", layout="wide", page_icon="⚙️")
+export_port = app_shell.start_page("System Status")
 
+# Rows in the registration extract checked for the Registration DB score.
+REGISTRATION_EXTRACT_ROWS = 200_000
 
-# --- Custom CSS for Tabung Haji Theme ---
-def apply_custom_theme():
-    """Applies a custom CSS theme to the Streamlit app."""
-    custom_css = """
-    <style>
-        /* Main colors */
-        :root {
-            --primary-color: #014034; /* Dark Green from TH */
-            --secondary-color: #04d61d; /* Lighter Green for buttons */
-            --background-color: #F0F2F6; /* Light gray background */
-            --text-color: #262730;
-            --secondary-text-color: #FFFFFF;
-        }
 
-        /* General app styling */
-        .stApp {
-            background-color: var(--background-color);
-        }
-
-        /* Sidebar styling */
-        [data-testid="stSidebar"] {
-            background-color: var(--secondary-color);
-        }
-        
-        /* CORRECTED: This targets all text and links within the sidebar nav items */
-        [data-testid="stSidebar"] .st-emotion-cache-16txtl3 a,
-        [data-testid="stSidebar"] .st-emotion-cache-16txtl3 {
-            color: var(--secondary-text-color);
-        }
-
-
-        /* Button styling */
-        .stButton>button {
-            color: var(--secondary-text-color);
-            background-color: var(--secondary-color);
-            border: none;
-            border-radius: 4px;
-        }
-        .stButton>button:hover {
-            background-color: #27AE60; /* Slightly lighter green on hover */
-            color: var(--secondary-text-color);
-        }
-
-        /* Metric styling */
-        [data-testid="stMetric"] {
-            background-color: #FFFFFF;
-            border-radius: 8px;
-            padding: 15px;
-            border: 1px solid #E0E0E0;
-        }
-
-        /* Alert boxes */
-        [data-testid="stAlert"] {
-            border-radius: 8px;
-        }
-
-        /* Progress bar styling */
-        [data-testid="stProgressBar"] > div > div > div > div {
-            background-color: var(--secondary-color);
-        }
-    </style>
-    """
-    st.markdown(custom_css, unsafe_allow_html=True)
-apply_custom_theme()
-
-# --- Sidebar ---
-with st.sidebar:
-    # --- Add Tabung Haji Logo ---
-    # Make sure you have a 'logo.png' file in the main app directory
-    try:
-        st.image("logo.png", use_container_width=True)
-    except Exception as e:
-        st.write("Place your logo.png file in the main app directory")
+@st.cache_resource
+def load_registration_extract():
+    """Loads the registration extract once per process and scores it."""
+    instrumentation.record_refresh()
+    return ingest_frame("Registration DB", generate_depositors(REGISTRATION_EXTRACT_ROWS, seed=0))
 
 st.title("⚙️ System Status & Implementation")
+instrumentation.first_paint()
 
 # --- Statistical Significance & Real-time Data ---
 col1, col2 = st.columns(2)
@@ -104,21 +45,56 @@ with col2:
         st.caption(f"Last updated: {time.strftime('%H:%M:%S')}")
 
         # System Health Monitor
-        st.markdown("""
-            | System             | Status    | Data Quality | Latency |
-            |--------------------|-----------|--------------|---------|
-            | **Registration DB** | 🟢 Healthy | 98%          | 23ms    |
-            | **Demographics API**| 🟠 Warning  | 94%          | 156ms   |
-            | **Quota System** | 🟢 Healthy | 99%          | 12ms    |
-            | **Appeals DB** | 🔴 Error   | 87%          | timeout |
-        """, unsafe_allow_html=True)
+        # Data Quality is the live score of a source's ingested records, and
+        # the source's last reported figure (marked as such) until it has one.
+        with instrumentation.section("data load"):
+            load_registration_extract()
+        systems = [
+            {"name": "Registration DB", "status": "🟢 Healthy", "quality": 0.98, "latency": "23ms"},
+            {"name": "Demographics API", "status": "🟠 Warning", "quality": 0.94, "latency": "156ms"},
+            {"name": "Quota System", "status": "🟢 Healthy", "quality": 0.99, "latency": "12ms"},
+            {"name": "Appeals DB", "status": "🔴 Error", "quality": 0.87, "latency": "timeout"},
+        ]
+        health_table = "| System | Status | Data Quality | Latency |\n|---|---|---|---|\n"
+        for system in systems:
+            quality = score_for(system["name"])
+            quality = f"{quality:.1%} (live)" if quality is not None else f"{system['quality']:.0%} (reported)"
+            health_table += f"| **{system['name']}** | {system['status']} | {quality} | {system['latency']} |\n"
+        st.markdown(health_table, unsafe_allow_html=True)
+        st.caption(f"Data Quality: live scores are computed from ingested records ({REGISTRATION_EXTRACT_ROWS:,}-row registration extract); reported figures come from the source and are not checked here.")
 
         # Real-time Stats
         stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
-        stat_col1.metric("Active Sessions", "1,247", "+23")
-        stat_col2.metric("Processing Queue", "156", "-12")
-        stat_col3.metric("Data Refresh Rate", "30s", "Normal")
-        stat_col4.metric("Memory Usage", "67%", "+2%")
+        metrics = instrumentation.snapshot()
+        memory_share = f"{metrics['memory_pct']:.1f}% of RAM" if metrics['memory_pct'] is not None else None
+        stat_col1.metric("Active Sessions", f"{metrics['active_sessions']:,}", help="Sessions that reran in the last 5 minutes")
+        stat_col2.metric("Processing Queue", f"{metrics['queue_depth']:,}", help="Reruns currently in progress")
+        stat_col3.metric("Data Refresh Rate", f"{metrics['data_refreshes_per_min']:.2f}/min", f"{metrics['data_refreshes']:,} total", delta_color="off",
+                         help="Datasets regenerated (cache misses) per minute since startup")
+        stat_col4.metric("Memory Usage", f"{metrics['rss_mb']:,.0f} MB", memory_share, delta_color="off")
+
+st.divider()
+
+# --- Render Performance ---
+st.header("Render Performance")
+with st.container(border=True):
+    st.markdown("Time spent in each page section on this server process, slowest first.")
+    if metrics['sections']:
+        df_sections = pd.DataFrame(metrics['sections']).sort_values("p95_ms", ascending=False)
+        df_sections = df_sections.rename(columns={
+            "page": "Page", "section": "Section", "count": "Runs", "mean_ms": "Mean (ms)", "p95_ms": "p95 (ms)"
+        })[["Page", "Section", "Runs", "Mean (ms)", "p95 (ms)"]]
+        st.dataframe(df_sections, hide_index=True, use_container_width=True)
+    if metrics['startup']:
+        st.markdown("**Cold Start** — the first load of each page since this server process started.")
+        df_startup = pd.DataFrame(metrics['startup']).rename(columns={
+            "page": "Page", "process_age_s": "Process Age (s)", "first_paint_ms": "First Paint (ms)", "rerun_ms": "Full Render (ms)"
+        })
+        st.dataframe(df_startup, hide_index=True, use_container_width=True)
+    if export_port:
+        st.caption(f"Metrics export: port {export_port}, /metrics (Prometheus) and /metrics.json.")
+    else:
+        st.caption(f"Set {instrumentation.METRICS_PORT_ENV} (and {instrumentation.METRICS_HOST_ENV} to listen beyond localhost) to expose /metrics and /metrics.json for scraping.")
 
 st.divider()
 
@@ -147,4 +123,6 @@ with col4:
         st.markdown("**Policy Effectiveness** (Target: +25%)")
         st.progress(92, text="⏳ +23% In Progress") # 23/25 = 92%
         st.markdown("**Resource Optimization** (Target: 30%)")
-        st.progress(93, text="⏳ 28% In Progress") # 28/30 = 93.3%
\ No newline at end of file
+        st.progress(93, text="⏳ 28% In Progress") # 28/30 = 93.3%
+
+instrumentation.finish_rerun()
\ No newline at end of file